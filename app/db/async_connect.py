@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from contextlib import asynccontextmanager
+from itertools import cycle
+from typing import TYPE_CHECKING, AsyncGenerator, Sequence
+
+from .connect import _resolve_driver, _set_mssql_session_options
+from .exceptions import DatabaseConnectionError
+
+# Defer the sqlalchemy.ext.asyncio import tree so importing this module
+# stays cheap for callers that never connect
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabaseConnection:
+    """
+    Manage async connection and session to SQL Server via aioodbc.
+    Construction via get_connection() factory method.
+    """
+
+    # Preference order - the first installed entry wins.
+    # Amend as needed or move to config/env
+    SUPPORTED_DRIVERS = (
+        "ODBC Driver 18 for SQL Server",
+        "ODBC Driver 17 for SQL Server",
+        "ODBC Driver 13 for SQL Server",
+        "SQL Server Native Client 11.0",
+    )
+
+    # Retry tuning - subclass or pass constructor kwargs to override
+    MAX_RETRIES = 3
+    BASE_DELAY = 1.0
+    BACKOFF_FACTOR = 2.0
+    MAX_DELAY = 30.0
+
+    def __init__(
+        self,
+        db: str,
+        host: str | Sequence[str],
+        port: int,
+        timeout: int = 5,
+        pool_size: int = 20,
+        max_overflow: int = 10,
+        pool_timeout: int = 20,
+        pool_recycle: int = 1800,
+        pool_pre_ping: bool = True,
+        encrypt: bool = True,
+        trust_server_certificate: bool = False,
+        poolclass: type | None = None,
+        max_retries: int | None = None,
+        base_delay: float | None = None,
+        backoff_factor: float | None = None,
+        max_delay: float | None = None,
+    ) -> None:
+        self._db = db
+        # A sequence of hosts (e.g. AlwaysOn read replicas) is rotated
+        # across connection attempts
+        self._hosts: tuple[str, ...] = (host,) if isinstance(host, str) else tuple(host)
+        self._port = port
+        self._timeout = timeout
+        self._pool_size = pool_size
+        self._max_overflow = max_overflow
+        self._pool_timeout = pool_timeout
+        self._pool_recycle = pool_recycle
+        self._pool_pre_ping = pool_pre_ping
+        self._encrypt = encrypt
+        self._trust_server_certificate = trust_server_certificate
+        self._poolclass = poolclass
+        self._max_retries = self.MAX_RETRIES if max_retries is None else max_retries
+        self._base_delay = self.BASE_DELAY if base_delay is None else base_delay
+        self._backoff_factor = (
+            self.BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+        )
+        self._max_delay = self.MAX_DELAY if max_delay is None else max_delay
+
+        self._engine: AsyncEngine | None = None
+        self._session_maker: async_sessionmaker | None = None
+
+    def _get_available_driver(self) -> str:
+        """
+        Get first available driver for the SQL Server.
+        """
+        return _resolve_driver(self.SUPPORTED_DRIVERS)
+
+    async def _probe_connection(self) -> None:
+        """
+        Open and close one connection to verify the engine works.
+        """
+        if self._engine is not None:
+            async with self._engine.connect():
+                pass
+
+    async def _init_connection(self) -> None:
+        """
+        Initialise connection with retries.
+        """
+        from sqlalchemy import event
+        from sqlalchemy.engine import URL
+        from sqlalchemy.exc import OperationalError, SQLAlchemyError
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        # Invariant across attempts - compute once, retry only the connect.
+        # A URL object skips SQLAlchemy's string parse and quoting of
+        # driver names containing spaces
+        driver = self._get_available_driver()
+        url_cycle = cycle(
+            URL.create(
+                "mssql+aioodbc",
+                host=host,
+                port=self._port,
+                database=self._db,
+                query={
+                    "driver": driver,
+                    "trusted_connection": "yes",
+                    # Skipping TLS on trusted networks avoids a handshake on
+                    # every pool refill (Encrypt defaults to yes on MSSQL 2022+)
+                    "Encrypt": "yes" if self._encrypt else "no",
+                    "TrustServerCertificate": (
+                        "yes" if self._trust_server_certificate else "no"
+                    ),
+                },
+            )
+            for host in self._hosts
+        )
+
+        engine_kwargs: dict = {
+            "fast_executemany": True,
+            "pool_recycle": self._pool_recycle,
+            "pool_pre_ping": self._pool_pre_ping,
+            "connect_args": {"timeout": self._timeout, "autocommit": False},
+        }
+        if self._poolclass is not None:
+            # e.g. NullPool for one-shot scripts; sizing options only
+            # apply to the default QueuePool
+            engine_kwargs["poolclass"] = self._poolclass
+        else:
+            engine_kwargs.update(
+                pool_size=self._pool_size,
+                max_overflow=self._max_overflow,
+                pool_timeout=self._pool_timeout,
+            )
+
+        for attempt in range(self._max_retries):
+            # Rotate hosts so a failed attempt retries against the next one
+            url = next(url_cycle)
+            try:
+                self._engine = create_async_engine(url, **engine_kwargs)
+                self._session_maker = async_sessionmaker(
+                    bind=self._engine, expire_on_commit=False
+                )
+                event.listen(
+                    self._engine.sync_engine, "connect", _set_mssql_session_options
+                )
+
+                # Test connection - fail early, bounded so a wedged server
+                # cannot hang past the timeout even if the driver ignores
+                # its own connect timeout
+                await asyncio.wait_for(
+                    self._probe_connection(), timeout=self._timeout + 5
+                )
+
+                logger.info(
+                    "Connection to database successful. Host: %s, Port: %s, Database: %s",
+                    url.host,
+                    self._port,
+                    self._db,
+                )
+
+                return
+
+            except (OperationalError, asyncio.TimeoutError) as e:
+                if attempt < self._max_retries - 1:
+                    # Jitter spreads reconnection load when many clients retry at once
+                    delay = min(
+                        self._max_delay,
+                        self._base_delay * (self._backoff_factor**attempt),
+                    ) * (0.5 + random.random())
+                    logger.warning(
+                        "Connection attempt %d failed. Retrying in %.1f seconds",
+                        attempt + 1,
+                        delay,
+                    )
+                    await asyncio.sleep(delay)
+                else:
+                    logger.error(
+                        "Failed to connect to database after %d attempts.",
+                        self._max_retries,
+                    )
+                    raise DatabaseConnectionError(
+                        f"Failed to connect to database: {str(e)}"
+                    ) from e
+
+            except SQLAlchemyError as e:
+                # Non-transient (e.g. bad URL or arguments) - retrying cannot help
+                logger.error("Unrecoverable error connecting to database: %s", e)
+                raise DatabaseConnectionError(
+                    f"Failed to connect to database: {str(e)}"
+                ) from e
+
+    @asynccontextmanager
+    async def get_async_session(self) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Get a new async session from the session maker.
+        """
+        if not self._session_maker:
+            raise DatabaseConnectionError("Database connection not initialised.")
+
+        session = self._session_maker()
+
+        try:
+            yield session
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error("Database session failed to commit: %s", e)
+            raise
+        finally:
+            await session.close()
+
+    async def _close(self) -> None:
+        """
+        Close the database connection and session maker.
+        """
+        if self._engine:
+            await self._engine.dispose()
+            self._engine = None
+            logger.info("Database connection closed.")
+
+    @classmethod
+    @asynccontextmanager
+    async def get_connection(
+        cls,
+        db: str,
+        host: str | Sequence[str],
+        port: int,
+        timeout: int = 5,
+        pool_size: int = 20,
+        max_overflow: int = 10,
+        pool_timeout: int = 20,
+        pool_recycle: int = 1800,
+        pool_pre_ping: bool = True,
+        encrypt: bool = True,
+        trust_server_certificate: bool = False,
+        poolclass: type | None = None,
+        max_retries: int | None = None,
+        base_delay: float | None = None,
+        backoff_factor: float | None = None,
+        max_delay: float | None = None,
+    ) -> AsyncGenerator["AsyncDatabaseConnection", None]:
+        """
+        Connect to the database and yield an AsyncDatabaseConnection instance.
+
+        Example:
+            async with AsyncDatabaseConnection.get_connection(db='mydb', host='localhost', port=1433, timeout=30) as db:
+                async with db.get_async_session() as session:
+                    # Use session to perform database operations
+                    pass
+        """
+        connection = cls(
+            db,
+            host,
+            port,
+            timeout,
+            pool_size,
+            max_overflow,
+            pool_timeout,
+            pool_recycle,
+            pool_pre_ping,
+            encrypt,
+            trust_server_certificate,
+            poolclass,
+            max_retries,
+            base_delay,
+            backoff_factor,
+            max_delay,
+        )
+        await connection._init_connection()
+        try:
+            yield connection
+        except Exception as e:
+            logger.error(
+                "Unexpected error occurred while connecting to database: %s", e
+            )
+            raise
+        finally:
+            await connection._close()
@@ -1,14 +1,54 @@
+from __future__ import annotations
+
+import functools
+import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
 from contextlib import contextmanager
+from itertools import cycle, islice
 from time import sleep
-from typing import Generator
-
-import pyodbc
-from sqlalchemy.engine import Engine, create_engine
-from sqlalchemy.exc import OperationalError, SQLAlchemyError
-from sqlalchemy.orm import Session, sessionmaker
+from typing import TYPE_CHECKING, Generator, Iterable, Sequence
 
 from .exceptions import DatabaseConnectionError
 
+# pyodbc is a large C extension and the sqlalchemy.orm import tree is
+# wide - defer both so importing this module stays cheap for callers
+# that never connect
+if TYPE_CHECKING:
+    from cachetools import TTLCache
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.orm import Session, scoped_session
+    from sqlalchemy.sql import Executable
+
+logger = logging.getLogger(__name__)
+
+
+def _set_mssql_session_options(dbapi_connection, _) -> None:  # type: ignore[no-untyped-def]
+    """
+    Runs once per physical pooled connection: suppress per-statement
+    DONE_IN_PROC rowcount messages and pin ARITHABORT on.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("SET NOCOUNT ON; SET ARITHABORT ON;")
+    cursor.close()
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_driver(supported: tuple[str, ...]) -> str:
+    """
+    Find the most preferred installed ODBC driver, memoised so the driver
+    manager registry is only enumerated once per process.
+    """
+    import pyodbc
+
+    installed = set(pyodbc.drivers())
+    driver = next((d for d in supported if d in installed), None)
+    if driver is None:
+        raise DatabaseConnectionError("No supported ODBC driver found.")
+    return driver
+
 
 class DatabaseConnection:
     """
@@ -16,112 +56,385 @@ class DatabaseConnection:
     Construction via get_connection() factory method.
     """
 
-    SUPPORTED_DRIVERS = frozenset(
-        {
-            # Amend as needed or move to config/env
-            "ODBC Driver 17 for SQL Server",
-            "ODBC Driver 13 for SQL Server",
-            "SQL Server Native Client 11.0",
-        }
+    # Preference order - the first installed entry wins.
+    # Amend as needed or move to config/env
+    SUPPORTED_DRIVERS = (
+        "ODBC Driver 18 for SQL Server",
+        "ODBC Driver 17 for SQL Server",
+        "ODBC Driver 13 for SQL Server",
+        "SQL Server Native Client 11.0",
     )
 
-    def __init__(self, db: str, host: str, port: int, timeout: int = 30) -> None:
+    # Retry tuning - subclass or pass constructor kwargs to override
+    MAX_RETRIES = 3
+    BASE_DELAY = 1.0
+    BACKOFF_FACTOR = 2.0
+    MAX_DELAY = 30.0
+
+    # Engines (and their pools) are shared process-wide so repeated
+    # get_connection() blocks reuse pooled connections instead of paying
+    # the TLS+auth handshake again
+    _engine_cache: dict[tuple, Engine] = {}
+
+    def __init__(
+        self,
+        db: str,
+        host: str | Sequence[str],
+        port: int,
+        timeout: int = 5,
+        pool_size: int = 20,
+        max_overflow: int = 10,
+        pool_timeout: int = 20,
+        pool_recycle: int = 1800,
+        pool_pre_ping: bool = True,
+        encrypt: bool = True,
+        trust_server_certificate: bool = False,
+        poolclass: type | None = None,
+        max_retries: int | None = None,
+        base_delay: float | None = None,
+        backoff_factor: float | None = None,
+        max_delay: float | None = None,
+    ) -> None:
         self._db = db
-        self._host = host
+        # A sequence of hosts (e.g. AlwaysOn read replicas) is rotated
+        # across connection attempts
+        self._hosts: tuple[str, ...] = (host,) if isinstance(host, str) else tuple(host)
         self._port = port
         self._timeout = timeout
+        self._pool_size = pool_size
+        self._max_overflow = max_overflow
+        self._pool_timeout = pool_timeout
+        self._pool_recycle = pool_recycle
+        self._pool_pre_ping = pool_pre_ping
+        self._encrypt = encrypt
+        self._trust_server_certificate = trust_server_certificate
+        self._poolclass = poolclass
+        self._max_retries = self.MAX_RETRIES if max_retries is None else max_retries
+        self._base_delay = self.BASE_DELAY if base_delay is None else base_delay
+        self._backoff_factor = (
+            self.BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+        )
+        self._max_delay = self.MAX_DELAY if max_delay is None else max_delay
 
         self._engine: Engine | None = None
-        self._session_maker: sessionmaker | None = None
+        self._session_maker: scoped_session | None = None
+        # One TTL cache per distinct ttl, created lazily by execute_cached.
+        # cachetools caches are not thread-safe, so access goes through
+        # the lock - sessions are thread-scoped but the connection is shared
+        self._result_caches: dict[int, TTLCache] = {}
+        self._result_cache_lock = threading.Lock()
 
     def _get_available_driver(self) -> str:
         """
         Get first available driver for the SQL Server.
         """
-        available_drivers = self.SUPPORTED_DRIVERS.intersection(pyodbc.drivers())
-        if not available_drivers:
-            raise DatabaseConnectionError("No supported ODBC driver found.")
-        return next(iter(available_drivers))
+        return _resolve_driver(self.SUPPORTED_DRIVERS)
+
+    def _probe_connection(self) -> None:
+        """
+        Open and close one connection to verify the engine works.
+        """
+        if self._engine is not None:
+            self._engine.connect().close()
+
+    def _make_session_maker(self) -> scoped_session:
+        """
+        Thread-scoped session factory. expire_on_commit=False skips the
+        post-commit attribute refresh roundtrip.
+        """
+        from sqlalchemy.orm import scoped_session, sessionmaker
+
+        return scoped_session(sessionmaker(bind=self._engine, expire_on_commit=False))
+
+    def _engine_cache_key(self) -> tuple:
+        """
+        Key identifying the connection target and engine configuration for
+        reuse. Pool settings are part of the key so a connection asking for
+        a differently sized pool gets its own engine rather than silently
+        inheriting an earlier one's.
+        """
+        return (
+            self._db,
+            self._hosts,
+            self._port,
+            self._timeout,
+            self._encrypt,
+            self._trust_server_certificate,
+            self._poolclass,
+            self._pool_size,
+            self._max_overflow,
+            self._pool_timeout,
+            self._pool_recycle,
+            self._pool_pre_ping,
+        )
 
     def _init_connection(self) -> None:
         """
         Initialise connection with retries.
         """
-        _max_retries = 3
-        _init_delay = 1
-        _backoff_factor = 2
+        from sqlalchemy import event
+        from sqlalchemy.engine import URL, create_engine
+        from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
-        for attempt in range(_max_retries):
-            try:
-                driver = self._get_available_driver()
-                connection_string = (
-                    f"mssql+pyodbc://{self._host}:{self._port}/{self._db}?"
-                    f"driver={driver}&trusted_connection=yes"
-                )
+        cached_engine = self._engine_cache.get(self._engine_cache_key())
+        if cached_engine is not None:
+            self._engine = cached_engine
+            self._session_maker = self._make_session_maker()
+            return
 
-                self._engine = create_engine(
-                    connection_string,
-                    fast_executemany=True,
-                    connect_args={"timeout": self._timeout},
-                )
-                self._session_maker = sessionmaker(bind=self._engine)
+        # Invariant across attempts - compute once, retry only the connect.
+        # A URL object skips SQLAlchemy's string parse and quoting of
+        # driver names containing spaces
+        driver = self._get_available_driver()
+        url_cycle = cycle(
+            URL.create(
+                "mssql+pyodbc",
+                host=host,
+                port=self._port,
+                database=self._db,
+                query={
+                    "driver": driver,
+                    "trusted_connection": "yes",
+                    # Skipping TLS on trusted networks avoids a handshake on
+                    # every pool refill (Encrypt defaults to yes on MSSQL 2022+)
+                    "Encrypt": "yes" if self._encrypt else "no",
+                    "TrustServerCertificate": (
+                        "yes" if self._trust_server_certificate else "no"
+                    ),
+                },
+            )
+            for host in self._hosts
+        )
 
-                # Test connection - fail early
-                with self._engine.connect():
-                    print(
-                        f"INFO: Connection to database successful. Host: {self._host}, Port: {self._port}, Database: {self._db}"
+        engine_kwargs: dict = {
+            "fast_executemany": True,
+            "pool_recycle": self._pool_recycle,
+            "pool_pre_ping": self._pool_pre_ping,
+            "connect_args": {"timeout": self._timeout, "autocommit": False},
+        }
+        if self._poolclass is not None:
+            # e.g. NullPool for one-shot scripts; sizing options only
+            # apply to the default QueuePool
+            engine_kwargs["poolclass"] = self._poolclass
+        else:
+            engine_kwargs.update(
+                pool_size=self._pool_size,
+                max_overflow=self._max_overflow,
+                pool_timeout=self._pool_timeout,
+            )
+
+        for attempt in range(self._max_retries):
+            # Rotate hosts so a failed attempt retries against the next one
+            url = next(url_cycle)
+            try:
+                self._engine = create_engine(url, **engine_kwargs)
+                self._session_maker = self._make_session_maker()
+                event.listen(self._engine, "connect", _set_mssql_session_options)
+
+                # Test connection - fail early. The probe runs in a worker
+                # so a wedged server cannot hang past the timeout even if
+                # the driver ignores its own connect timeout
+                executor = ThreadPoolExecutor(max_workers=1)
+                try:
+                    executor.submit(self._probe_connection).result(
+                        timeout=self._timeout + 5
                     )
+                finally:
+                    executor.shutdown(wait=False, cancel_futures=True)
 
+                logger.info(
+                    "Connection to database successful. Host: %s, Port: %s, Database: %s",
+                    url.host,
+                    self._port,
+                    self._db,
+                )
+
+                self._engine_cache[self._engine_cache_key()] = self._engine
                 return
 
-            except (OperationalError, SQLAlchemyError) as e:
-                if attempt < _max_retries - 1:
-                    delay = _init_delay * (_backoff_factor**attempt)
-                    print(
-                        f"WARNING: Connection attempt {attempt + 1} failed. Retrying in {delay} seconds"
+            except (OperationalError, FutureTimeout) as e:
+                if attempt < self._max_retries - 1:
+                    # Jitter spreads reconnection load when many clients retry at once
+                    delay = min(
+                        self._max_delay,
+                        self._base_delay * (self._backoff_factor**attempt),
+                    ) * (0.5 + random.random())
+                    logger.warning(
+                        "Connection attempt %d failed. Retrying in %.1f seconds",
+                        attempt + 1,
+                        delay,
                     )
                     sleep(delay)
                 else:
-                    print(
-                        f"ERROR: Failed to connect to database after {_max_retries} attempts."
+                    logger.error(
+                        "Failed to connect to database after %d attempts.",
+                        self._max_retries,
                     )
                     raise DatabaseConnectionError(
                         f"Failed to connect to database: {str(e)}"
                     ) from e
 
+            except SQLAlchemyError as e:
+                # Non-transient (e.g. bad URL or arguments) - retrying cannot help
+                logger.error("Unrecoverable error connecting to database: %s", e)
+                raise DatabaseConnectionError(
+                    f"Failed to connect to database: {str(e)}"
+                ) from e
+
     @contextmanager
-    def get_session(self) -> Generator[Session, None, None]:
+    def get_session(self, readonly: bool = False) -> Generator[Session, None, None]:
         """
-        Get a new session from the session maker.
+        Get a session for the current scope. Pass readonly=True for pure
+        read workloads to skip the commit on exit.
         """
-        if not self._session_maker:
+        # Single attribute load on the hot path
+        factory = self._session_maker
+        if factory is None:
             raise DatabaseConnectionError("Database connection not initialised.")
 
-        session = self._session_maker()
+        session = factory()
 
         try:
             yield session
-            session.commit()
-        except Exception as e:
+            if not readonly:
+                session.commit()
+        except BaseException as e:
             session.rollback()
-            print(f"ERROR: Database session failed to commit: {str(e)}")
+            logger.error("Database session failed to commit: %s", e)
+            raise
+        finally:
+            # Releases the session for the current scope (thread)
+            factory.remove()
+
+    def execute_cached(
+        self,
+        session: Session,
+        statement: str | Executable,
+        params: dict | None = None,
+        ttl: int = 60,
+    ) -> list:
+        """
+        Execute a statement, serving repeated SELECTs from an in-process
+        TTL cache to skip the database roundtrip entirely. Only SELECT
+        statements are cached; anything else always hits the database.
+        """
+        from cachetools import TTLCache
+        from sqlalchemy import text
+        from sqlalchemy.engine import CursorResult
+
+        if isinstance(statement, str):
+            statement = text(statement)
+
+        # Every concrete statement is a ClauseElement with compile(), even
+        # though the Executable mixin itself does not declare it
+        compiled = statement.compile()  # type: ignore[attr-defined]
+        if not str(compiled).lstrip().upper().startswith("SELECT"):
+            result = session.execute(statement, params)
+            # DML yields a closed cursor result with no rows to fetch
+            if isinstance(result, CursorResult) and not result.returns_rows:
+                return []
+            return list(result.fetchall())
+
+        # Compiled params distinguish Core selects whose SQL text is
+        # identical (str() renders placeholders only); repr keeps the key
+        # hashable when bound values include lists (the expanding-IN pattern)
+        key = (
+            str(compiled),
+            repr(sorted(compiled.params.items())) if compiled.params else "",
+            repr(sorted(params.items())) if params else "",
+        )
+        with self._result_cache_lock:
+            cache = self._result_caches.get(ttl)
+            if cache is None:
+                cache = self._result_caches[ttl] = TTLCache(maxsize=1024, ttl=ttl)
+            rows = cache.get(key)
+
+        if rows is None:
+            # Materialise so cached results are independent of the session
+            rows = list(session.execute(statement, params).fetchall())
+            with self._result_cache_lock:
+                cache[key] = rows
+
+        # Copy on the way out so callers mutating their result cannot
+        # poison later reads of the cached entry
+        return list(rows)
+
+    def bulk_insert(
+        self,
+        table_name: str,
+        columns: list[str],
+        rows: Iterable[tuple],
+        chunk_size: int = 1000,
+    ) -> None:
+        """
+        Insert rows in batches through the raw pyodbc cursor with
+        fast_executemany, cutting per-row roundtrips to one per chunk.
+        """
+        if not self._engine:
+            raise DatabaseConnectionError("Database connection not initialised.")
+
+        placeholders = ", ".join("?" * len(columns))
+        statement = (
+            f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+        )
+
+        raw_connection = self._engine.raw_connection()
+        try:
+            cursor = raw_connection.cursor()
+            # pyodbc-specific attribute, not part of the DBAPI cursor protocol
+            cursor.fast_executemany = True  # type: ignore[attr-defined]
+            rows_iter = iter(rows)
+            while chunk := list(islice(rows_iter, chunk_size)):
+                cursor.executemany(statement, chunk)
+            cursor.close()
+            raw_connection.commit()
+        except Exception as e:
+            raw_connection.rollback()
+            logger.error("Bulk insert into %s failed: %s", table_name, e)
             raise
         finally:
-            session.close()
+            raw_connection.close()
 
     def _close(self) -> None:
         """
-        Close the database connection and session maker.
+        Detach from the shared engine. The engine itself stays cached so
+        later connection contexts reuse its pool; call shutdown() to
+        dispose engines for good.
+        """
+        self._engine = None
+        self._session_maker = None
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        Dispose all cached engines and their pooled connections.
+        Call once at process exit.
         """
-        if self._engine:
-            self._engine.dispose()
-            self._engine = None
-            print("INFO: Database connection closed.")
+        for engine in cls._engine_cache.values():
+            engine.dispose()
+        cls._engine_cache.clear()
+        logger.info("Database connection closed.")
 
     @classmethod
     @contextmanager
     def get_connection(
-        cls, db: str, host: str, port: int, timeout: int = 30
+        cls,
+        db: str,
+        host: str | Sequence[str],
+        port: int,
+        timeout: int = 5,
+        pool_size: int = 20,
+        max_overflow: int = 10,
+        pool_timeout: int = 20,
+        pool_recycle: int = 1800,
+        pool_pre_ping: bool = True,
+        encrypt: bool = True,
+        trust_server_certificate: bool = False,
+        poolclass: type | None = None,
+        max_retries: int | None = None,
+        base_delay: float | None = None,
+        backoff_factor: float | None = None,
+        max_delay: float | None = None,
     ) -> Generator["DatabaseConnection", None, None]:
         """
         Connect to the database and yield a DatabaseConnection instance.
@@ -132,13 +445,30 @@ class DatabaseConnection:
                     # Use session to perform database operations
                     pass
         """
-        connection = cls(db, host, port, timeout)
+        connection = cls(
+            db,
+            host,
+            port,
+            timeout,
+            pool_size,
+            max_overflow,
+            pool_timeout,
+            pool_recycle,
+            pool_pre_ping,
+            encrypt,
+            trust_server_certificate,
+            poolclass,
+            max_retries,
+            base_delay,
+            backoff_factor,
+            max_delay,
+        )
         connection._init_connection()
         try:
             yield connection
         except Exception as e:
-            print(
-                f"ERROR: Unexpected error occurred while connecting to database: {str(e)}"
+            logger.error(
+                "Unexpected error occurred while connecting to database: %s", e
             )
             raise
         finally:
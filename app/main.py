@@ -1,13 +1,21 @@
 # Sample usage
 
+import logging
+
+from sqlalchemy.pool import NullPool
+
 from app.db.connect import DatabaseConnection
 
+logging.basicConfig(level=logging.INFO)
+
 
 def main() -> None:
+    # One query then exit - NullPool avoids keeping idle connections open
     with DatabaseConnection.get_connection(
         db="sample",
         host="localhost",
         port=1433,
+        poolclass=NullPool,
     ) as db:
         with db.get_session() as session:
             result = session.execute("SELECT 1")
@@ -0,0 +1,248 @@
+import asyncio
+from typing import Awaitable, TypeVar
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.engine import URL
+
+from app.db.async_connect import AsyncDatabaseConnection
+from app.db.connect import _resolve_driver, _set_mssql_session_options
+from app.db.exceptions import DatabaseConnectionError
+
+T = TypeVar("T")
+
+
+@pytest.fixture(autouse=True)
+def clear_driver_cache() -> None:
+    """Reset the memoised driver lookup between tests."""
+    _resolve_driver.cache_clear()
+
+
+def run(coro: Awaitable[T]) -> T:
+    """Drive an async scenario from a synchronous test."""
+    return asyncio.run(coro)  # type: ignore[arg-type]
+
+
+@pytest.fixture
+def db_params() -> dict[str, str | int]:
+    """Fixture providing standard database connection parameters."""
+    return {
+        "db": "test_db",  # str
+        "host": "test_host",  # str
+        "port": 1433,  # int
+        "timeout": 30,  # int
+    }
+
+
+@pytest.fixture
+def mock_async_engine() -> MagicMock:
+    """Fixture providing a mock SQLAlchemy async engine."""
+    engine = MagicMock()
+    engine.connect.return_value.__aenter__ = AsyncMock(return_value=MagicMock())
+    engine.connect.return_value.__aexit__ = AsyncMock(return_value=None)
+    engine.dispose = AsyncMock()
+    return engine
+
+
+@pytest.fixture
+def mock_async_session() -> AsyncMock:
+    """Fixture providing a mock SQLAlchemy async session."""
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_async_session_maker(mock_async_session: AsyncMock) -> MagicMock:
+    """Fixture providing a mock SQLAlchemy async_sessionmaker."""
+    session_maker = MagicMock()
+    session_maker.return_value = mock_async_session
+    return session_maker
+
+
+class TestAsyncDatabaseConnection:
+    def test_init(self, db_params: dict[str, str | int]) -> None:
+        """Test AsyncDatabaseConnection initialisation."""
+        connection = AsyncDatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+
+        assert connection._db == db_params["db"]
+        assert connection._hosts == (db_params["host"],)
+        assert connection._port == db_params["port"]
+        assert connection._timeout == db_params["timeout"]
+        assert connection._engine is None
+        assert connection._session_maker is None
+
+    def test_init_connection_success(
+        self, db_params: dict[str, str | int], mock_async_engine: MagicMock
+    ) -> None:
+        """Test successful async database connection initialisation."""
+        connection = AsyncDatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+
+        with (
+            patch(
+                "sqlalchemy.ext.asyncio.create_async_engine",
+                return_value=mock_async_engine,
+            ) as mock_create_engine,
+            patch("sqlalchemy.ext.asyncio.async_sessionmaker") as mock_sessionmaker,
+            patch("sqlalchemy.event") as mock_event,
+            patch.object(
+                connection,
+                "_get_available_driver",
+                return_value="ODBC Driver 17 for SQL Server",
+            ),
+            patch("pyodbc.drivers", return_value=["ODBC Driver 17 for SQL Server"]),
+        ):
+            run(connection._init_connection())
+
+            expected_url = URL.create(
+                "mssql+aioodbc",
+                host=str(db_params["host"]),
+                port=int(db_params["port"]),
+                database=str(db_params["db"]),
+                query={
+                    "driver": "ODBC Driver 17 for SQL Server",
+                    "trusted_connection": "yes",
+                    "Encrypt": "yes",
+                    "TrustServerCertificate": "no",
+                },
+            )
+
+            mock_create_engine.assert_called_once_with(
+                expected_url,
+                fast_executemany=True,
+                pool_size=20,
+                max_overflow=10,
+                pool_timeout=20,
+                pool_recycle=1800,
+                pool_pre_ping=True,
+                connect_args={"timeout": db_params["timeout"], "autocommit": False},
+            )
+            mock_sessionmaker.assert_called_once_with(
+                bind=mock_async_engine, expire_on_commit=False
+            )
+            mock_event.listen.assert_called_once_with(
+                mock_async_engine.sync_engine, "connect", _set_mssql_session_options
+            )
+            mock_async_engine.connect.assert_called_once()
+
+    def test_get_async_session_success(
+        self,
+        db_params: dict[str, str | int],
+        mock_async_session_maker: MagicMock,
+        mock_async_session: AsyncMock,
+    ) -> None:
+        """Test successful async session creation and usage."""
+        connection = AsyncDatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+        connection._session_maker = mock_async_session_maker
+
+        async def scenario() -> None:
+            async with connection.get_async_session() as session:
+                assert session == mock_async_session
+
+        run(scenario())
+
+        mock_async_session.commit.assert_awaited_once()
+        mock_async_session.close.assert_awaited_once()
+
+    def test_get_async_session_not_initialised(
+        self, db_params: dict[str, str | int]
+    ) -> None:
+        """Test get_async_session when connection is not initialised."""
+        connection = AsyncDatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+
+        async def scenario() -> None:
+            async with connection.get_async_session():
+                pass
+
+        with pytest.raises(DatabaseConnectionError) as exc_info:
+            run(scenario())
+
+        assert str(exc_info.value) == "Database connection not initialised."
+
+    def test_get_async_session_with_error(
+        self,
+        db_params: dict[str, str | int],
+        mock_async_session_maker: MagicMock,
+        mock_async_session: AsyncMock,
+    ) -> None:
+        """Test async session handling when an error occurs."""
+        connection = AsyncDatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+        connection._session_maker = mock_async_session_maker
+
+        async def scenario() -> None:
+            async with connection.get_async_session():
+                raise ValueError("Test error")
+
+        with pytest.raises(ValueError):
+            run(scenario())
+
+        mock_async_session.rollback.assert_awaited_once()
+        mock_async_session.close.assert_awaited_once()
+
+    def test_close(
+        self, db_params: dict[str, str | int], mock_async_engine: MagicMock
+    ) -> None:
+        """Test async connection closure."""
+        connection = AsyncDatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+        connection._engine = mock_async_engine
+
+        run(connection._close())
+
+        mock_async_engine.dispose.assert_awaited_once()
+        assert connection._engine is None
+
+    def test_get_connection_context_manager(
+        self, db_params: dict[str, str | int], mock_async_engine: MagicMock
+    ) -> None:
+        """Test the get_connection async context manager."""
+        with (
+            patch(
+                "sqlalchemy.ext.asyncio.create_async_engine",
+                return_value=mock_async_engine,
+            ),
+            patch("sqlalchemy.ext.asyncio.async_sessionmaker"),
+            patch("sqlalchemy.event"),
+            patch("pyodbc.drivers", return_value=["ODBC Driver 17 for SQL Server"]),
+        ):
+
+            async def scenario() -> None:
+                async with AsyncDatabaseConnection.get_connection(
+                    db=str(db_params["db"]),
+                    host=str(db_params["host"]),
+                    port=int(db_params["port"]),
+                    timeout=int(db_params["timeout"]),
+                ) as connection:
+                    assert isinstance(connection, AsyncDatabaseConnection)
+                    assert connection._engine == mock_async_engine
+
+            run(scenario())
+
+            mock_async_engine.dispose.assert_awaited_once()
@@ -1,12 +1,46 @@
+from collections.abc import Generator
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import cast
 from unittest.mock import MagicMock, patch
 
 import pytest
-from sqlalchemy.exc import OperationalError
-
-from app.db.connect import DatabaseConnection
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    bindparam,
+    create_engine,
+    select,
+    text,
+)
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.db.connect import (
+    DatabaseConnection,
+    _resolve_driver,
+    _set_mssql_session_options,
+)
 from app.db.exceptions import DatabaseConnectionError
 
 
+def _operational_error(message: str = "mock error") -> OperationalError:
+    """Build an OperationalError with a concrete original exception, as the
+    driver would, keeping the constructor call well-typed."""
+    return OperationalError(message, None, Exception(message))
+
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> None:
+    """Reset the memoised driver lookup and engine cache between tests."""
+    _resolve_driver.cache_clear()
+    DatabaseConnection._engine_cache.clear()
+
+
 @pytest.fixture
 def db_params() -> dict[str, str | int]:
     """Fixture providing standard database connection parameters."""
@@ -26,6 +60,17 @@ def mock_engine() -> MagicMock:
     return engine
 
 
+@pytest.fixture
+def sqlite_session() -> Generator[Session, None, None]:
+    """Fixture providing a real session against an in-memory SQLite database."""
+    engine = create_engine("sqlite://")
+    with Session(engine) as session:
+        session.execute(text("CREATE TABLE test_table (id INTEGER, name TEXT)"))
+        session.execute(text("INSERT INTO test_table VALUES (1, 'a'), (2, 'b')"))
+        yield session
+    engine.dispose()
+
+
 @pytest.fixture
 def mock_session() -> MagicMock:
     """Fixture providing a mock SQLAlchemy session."""
@@ -51,12 +96,50 @@ class TestDatabaseConnection:
         )
 
         assert connection._db == db_params["db"]
-        assert connection._host == db_params["host"]
+        assert connection._hosts == (db_params["host"],)
         assert connection._port == db_params["port"]
         assert connection._timeout == db_params["timeout"]
+        assert connection._pool_size == 20
+        assert connection._max_overflow == 10
+        assert connection._pool_timeout == 20
+        assert connection._pool_recycle == 1800
+        assert connection._pool_pre_ping is True
+        assert connection._encrypt is True
+        assert connection._trust_server_certificate is False
         assert connection._engine is None
         assert connection._session_maker is None
 
+    def test_init_retry_defaults(self, db_params: dict[str, str | int]) -> None:
+        """Test retry tuning defaults come from the class attributes."""
+        connection = DatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+        )
+
+        assert connection._timeout == 5
+        assert connection._max_retries == DatabaseConnection.MAX_RETRIES
+        assert connection._base_delay == DatabaseConnection.BASE_DELAY
+        assert connection._backoff_factor == DatabaseConnection.BACKOFF_FACTOR
+        assert connection._max_delay == DatabaseConnection.MAX_DELAY
+
+    def test_init_retry_overrides(self, db_params: dict[str, str | int]) -> None:
+        """Test per-instance retry tuning overrides the class defaults."""
+        connection = DatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            max_retries=5,
+            base_delay=0.5,
+            backoff_factor=3.0,
+            max_delay=10.0,
+        )
+
+        assert connection._max_retries == 5
+        assert connection._base_delay == 0.5
+        assert connection._backoff_factor == 3.0
+        assert connection._max_delay == 10.0
+
     @pytest.mark.parametrize(
         "available_drivers,expected_driver",
         [
@@ -69,6 +152,15 @@ class TestDatabaseConnection:
                 "SQL Server Native Client 11.0",
             ),
             (["ODBC Driver 13 for SQL Server"], "ODBC Driver 13 for SQL Server"),
+            (
+                # Most preferred installed driver wins
+                [
+                    "SQL Server Native Client 11.0",
+                    "ODBC Driver 18 for SQL Server",
+                    "ODBC Driver 17 for SQL Server",
+                ],
+                "ODBC Driver 18 for SQL Server",
+            ),
         ],
     )
     def test_get_available_driver_success(
@@ -106,6 +198,16 @@ class TestDatabaseConnection:
 
             assert str(exc_info.value) == "No supported ODBC driver found."
 
+    def test_set_mssql_session_options(self) -> None:
+        """Test the per-connection handler issues the session options."""
+        dbapi_connection = MagicMock()
+
+        _set_mssql_session_options(dbapi_connection, MagicMock())
+
+        cursor = dbapi_connection.cursor.return_value
+        cursor.execute.assert_called_once_with("SET NOCOUNT ON; SET ARITHABORT ON;")
+        cursor.close.assert_called_once()
+
     def test_init_connection_success(
         self, db_params: dict[str, str | int], mock_engine: MagicMock
     ) -> None:
@@ -119,9 +221,11 @@ class TestDatabaseConnection:
 
         with (
             patch(
-                "app.db.connect.create_engine", return_value=mock_engine
+                "sqlalchemy.engine.create_engine", return_value=mock_engine
             ) as mock_create_engine,
-            patch("app.db.connect.sessionmaker") as mock_sessionmaker,
+            patch("sqlalchemy.orm.sessionmaker") as mock_sessionmaker,
+            patch("sqlalchemy.orm.scoped_session") as mock_scoped_session,
+            patch("sqlalchemy.event") as mock_event,
             patch.object(
                 connection,
                 "_get_available_driver",
@@ -131,19 +235,66 @@ class TestDatabaseConnection:
         ):
             connection._init_connection()
 
-            expected_connection_string = (
-                f"mssql+pyodbc://{db_params['host']}:{db_params['port']}/{db_params['db']}?"
-                "driver=ODBC Driver 17 for SQL Server&trusted_connection=yes"
+            expected_url = URL.create(
+                "mssql+pyodbc",
+                host=str(db_params["host"]),
+                port=int(db_params["port"]),
+                database=str(db_params["db"]),
+                query={
+                    "driver": "ODBC Driver 17 for SQL Server",
+                    "trusted_connection": "yes",
+                    "Encrypt": "yes",
+                    "TrustServerCertificate": "no",
+                },
             )
 
             mock_create_engine.assert_called_once_with(
-                expected_connection_string,
+                expected_url,
                 fast_executemany=True,
-                connect_args={"timeout": db_params["timeout"]},
+                pool_size=20,
+                max_overflow=10,
+                pool_timeout=20,
+                pool_recycle=1800,
+                pool_pre_ping=True,
+                connect_args={"timeout": db_params["timeout"], "autocommit": False},
+            )
+            mock_sessionmaker.assert_called_once_with(
+                bind=mock_engine, expire_on_commit=False
+            )
+            mock_scoped_session.assert_called_once_with(mock_sessionmaker.return_value)
+            mock_event.listen.assert_called_once_with(
+                mock_engine, "connect", _set_mssql_session_options
             )
-            mock_sessionmaker.assert_called_once_with(bind=mock_engine)
             mock_engine.connect.assert_called_once()
 
+    def test_init_connection_with_poolclass(
+        self, db_params: dict[str, str | int], mock_engine: MagicMock
+    ) -> None:
+        """Test poolclass is passed through in place of pool sizing options."""
+        connection = DatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+            poolclass=NullPool,
+        )
+
+        with (
+            patch(
+                "sqlalchemy.engine.create_engine", return_value=mock_engine
+            ) as mock_create_engine,
+            patch("sqlalchemy.orm.sessionmaker"),
+            patch("sqlalchemy.event"),
+            patch("pyodbc.drivers", return_value=["ODBC Driver 17 for SQL Server"]),
+        ):
+            connection._init_connection()
+
+            engine_kwargs = mock_create_engine.call_args.kwargs
+            assert engine_kwargs["poolclass"] == NullPool
+            assert "pool_size" not in engine_kwargs
+            assert "max_overflow" not in engine_kwargs
+            assert "pool_timeout" not in engine_kwargs
+
     def test_init_connection_retry_success(
         self, db_params: dict[str, str | int], mock_engine: MagicMock
     ) -> None:
@@ -156,27 +307,95 @@ class TestDatabaseConnection:
         )
 
         with (
-            patch("app.db.connect.create_engine") as mock_create_engine,
-            patch("app.db.connect.sessionmaker") as mock_sessionmaker,
+            patch("sqlalchemy.engine.create_engine") as mock_create_engine,
+            patch("sqlalchemy.orm.sessionmaker") as mock_sessionmaker,
+            patch("sqlalchemy.event"),
             patch("app.db.connect.sleep") as mock_sleep,
+            patch("app.db.connect.random.random", return_value=0.5),
             patch.object(
                 connection,
                 "_get_available_driver",
                 return_value="ODBC Driver 17 for SQL Server",
-            ),
+            ) as mock_get_driver,
             patch("pyodbc.drivers", return_value=["ODBC Driver 17 for SQL Server"]),
         ):
             # First attempt fails, second succeeds
             mock_create_engine.side_effect = [
-                OperationalError("mock error", None, None),
+                _operational_error(),
                 mock_engine,
             ]
 
             connection._init_connection()
 
             assert mock_create_engine.call_count == 2
-            mock_sleep.assert_called_once_with(1)  # First retry delay
-            mock_sessionmaker.assert_called_once_with(bind=mock_engine)
+            mock_get_driver.assert_called_once()  # Resolved once, outside the loop
+            mock_sleep.assert_called_once_with(1.0)  # First retry delay, full jitter
+            mock_sessionmaker.assert_called_once_with(
+                bind=mock_engine, expire_on_commit=False
+            )
+
+    def test_init_connection_probe_timeout_retried(
+        self, db_params: dict[str, str | int], mock_engine: MagicMock
+    ) -> None:
+        """Test a hung connection probe is treated as a transient failure."""
+        connection = DatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+
+        with (
+            patch("sqlalchemy.engine.create_engine", return_value=mock_engine),
+            patch("sqlalchemy.orm.sessionmaker"),
+            patch("sqlalchemy.event"),
+            patch("app.db.connect.ThreadPoolExecutor") as mock_executor,
+            patch("app.db.connect.sleep") as mock_sleep,
+            patch("app.db.connect.random.random", return_value=0.5),
+            patch("pyodbc.drivers", return_value=["ODBC Driver 17 for SQL Server"]),
+        ):
+            # First probe hangs past the deadline, second succeeds
+            mock_executor.return_value.submit.return_value.result.side_effect = [
+                FutureTimeout(),
+                None,
+            ]
+
+            connection._init_connection()
+
+            mock_sleep.assert_called_once_with(1.0)
+            assert connection._engine == mock_engine
+
+    def test_init_connection_failover_to_second_host(
+        self, db_params: dict[str, str | int], mock_engine: MagicMock
+    ) -> None:
+        """Test retries rotate to the next host in the sequence."""
+        connection = DatabaseConnection(
+            db=str(db_params["db"]),
+            host=["host_a", "host_b"],
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+
+        with (
+            patch("sqlalchemy.engine.create_engine") as mock_create_engine,
+            patch("sqlalchemy.orm.sessionmaker"),
+            patch("sqlalchemy.event"),
+            patch("app.db.connect.sleep"),
+            patch("app.db.connect.random.random", return_value=0.5),
+            patch("pyodbc.drivers", return_value=["ODBC Driver 17 for SQL Server"]),
+        ):
+            # First host fails, second succeeds
+            mock_create_engine.side_effect = [
+                _operational_error(),
+                mock_engine,
+            ]
+
+            connection._init_connection()
+
+            attempted_hosts = [
+                call.args[0].host for call in mock_create_engine.call_args_list
+            ]
+            assert attempted_hosts == ["host_a", "host_b"]
 
     def test_init_connection_all_retries_fail(
         self, db_params: dict[str, str | int]
@@ -188,10 +407,10 @@ class TestDatabaseConnection:
             port=int(db_params["port"]),
             timeout=int(db_params["timeout"]),
         )
-        error = OperationalError("mock error", None, None)
+        error = _operational_error()
 
         with (
-            patch("app.db.connect.create_engine", side_effect=error),
+            patch("sqlalchemy.engine.create_engine", side_effect=error),
             patch("app.db.connect.sleep") as mock_sleep,
             patch.object(
                 connection,
@@ -206,6 +425,34 @@ class TestDatabaseConnection:
             assert "Failed to connect to database:" in str(exc_info.value)
             assert mock_sleep.call_count == 2  # Two retries with delays
 
+    def test_init_connection_non_retryable_error(
+        self, db_params: dict[str, str | int]
+    ) -> None:
+        """Test connection initialisation fails fast on non-transient errors."""
+        connection = DatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+        error = SQLAlchemyError("mock unrecoverable error")
+
+        with (
+            patch("sqlalchemy.engine.create_engine", side_effect=error),
+            patch("app.db.connect.sleep") as mock_sleep,
+            patch.object(
+                connection,
+                "_get_available_driver",
+                return_value="ODBC Driver 17 for SQL Server",
+            ),
+            patch("pyodbc.drivers", return_value=["ODBC Driver 17 for SQL Server"]),
+        ):
+            with pytest.raises(DatabaseConnectionError) as exc_info:
+                connection._init_connection()
+
+            assert "Failed to connect to database:" in str(exc_info.value)
+            mock_sleep.assert_not_called()  # No backoff for unrecoverable errors
+
     def test_get_session_success(
         self,
         db_params: dict[str, str | int],
@@ -225,7 +472,28 @@ class TestDatabaseConnection:
             assert session == mock_session
 
         mock_session.commit.assert_called_once()
-        mock_session.close.assert_called_once()
+        mock_session_maker.remove.assert_called_once()
+
+    def test_get_session_readonly(
+        self,
+        db_params: dict[str, str | int],
+        mock_session_maker: MagicMock,
+        mock_session: MagicMock,
+    ) -> None:
+        """Test readonly sessions skip the commit on exit."""
+        connection = DatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+        connection._session_maker = mock_session_maker
+
+        with connection.get_session(readonly=True) as session:
+            assert session == mock_session
+
+        mock_session.commit.assert_not_called()
+        mock_session_maker.remove.assert_called_once()
 
     def test_get_session_not_initialised(self, db_params: dict[str, str | int]) -> None:
         """Test get_session when connection is not initialised."""
@@ -263,12 +531,195 @@ class TestDatabaseConnection:
                 raise test_error
 
         mock_session.rollback.assert_called_once()
-        mock_session.close.assert_called_once()
+        mock_session_maker.remove.assert_called_once()
 
-    def test_close(
+    def test_execute_cached_serves_repeat_selects_from_cache(
+        self, db_params: dict[str, str | int], sqlite_session: Session
+    ) -> None:
+        """Test repeated SELECTs are served from the cache."""
+        connection = DatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+        statement = "SELECT id, name FROM test_table ORDER BY id"
+
+        with patch.object(
+            sqlite_session, "execute", wraps=sqlite_session.execute
+        ) as execute_spy:
+            first = connection.execute_cached(sqlite_session, statement)
+            second = connection.execute_cached(sqlite_session, statement)
+
+        assert first == [(1, "a"), (2, "b")]
+        assert second == first
+        assert execute_spy.call_count == 1
+
+    def test_execute_cached_distinct_params_miss(
+        self, db_params: dict[str, str | int], sqlite_session: Session
+    ) -> None:
+        """Test different bind params produce separate cache entries."""
+        connection = DatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+        statement = "SELECT name FROM test_table WHERE id = :id"
+
+        with patch.object(
+            sqlite_session, "execute", wraps=sqlite_session.execute
+        ) as execute_spy:
+            first = connection.execute_cached(sqlite_session, statement, params={"id": 1})
+            second = connection.execute_cached(sqlite_session, statement, params={"id": 2})
+
+        assert first == [("a",)]
+        assert second == [("b",)]
+        assert execute_spy.call_count == 2
+
+    def test_execute_cached_distinct_core_literals_miss(
+        self, db_params: dict[str, str | int], sqlite_session: Session
+    ) -> None:
+        """Test Core selects differing only in a literal get separate entries."""
+        connection = DatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+        table = Table(
+            "test_table",
+            MetaData(),
+            Column("id", Integer),
+            Column("name", String),
+        )
+
+        first = connection.execute_cached(
+            sqlite_session, select(table.c.name).where(table.c.id == 1)
+        )
+        second = connection.execute_cached(
+            sqlite_session, select(table.c.name).where(table.c.id == 2)
+        )
+
+        assert first == [("a",)]
+        assert second == [("b",)]
+
+    def test_execute_cached_hit_returns_copy(
+        self, db_params: dict[str, str | int], sqlite_session: Session
+    ) -> None:
+        """Test mutating a returned result does not poison the cached entry."""
+        connection = DatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+        statement = "SELECT id, name FROM test_table ORDER BY id"
+
+        first = connection.execute_cached(sqlite_session, statement)
+        first.append(("tampered",))
+        second = connection.execute_cached(sqlite_session, statement)
+
+        assert second == [(1, "a"), (2, "b")]
+
+    def test_execute_cached_list_params(
+        self, db_params: dict[str, str | int], sqlite_session: Session
+    ) -> None:
+        """Test list-valued params (expanding IN) produce a usable cache key."""
+        connection = DatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+        statement = text("SELECT name FROM test_table WHERE id IN :ids").bindparams(
+            bindparam("ids", expanding=True)
+        )
+
+        with patch.object(
+            sqlite_session, "execute", wraps=sqlite_session.execute
+        ) as execute_spy:
+            first = connection.execute_cached(
+                sqlite_session, statement, params={"ids": [1, 2]}
+            )
+            second = connection.execute_cached(
+                sqlite_session, statement, params={"ids": [1, 2]}
+            )
+            third = connection.execute_cached(
+                sqlite_session, statement, params={"ids": [1]}
+            )
+
+        assert first == [("a",), ("b",)]
+        assert second == first
+        assert third == [("a",)]
+        assert execute_spy.call_count == 2
+
+    def test_execute_cached_skips_non_select(
+        self, db_params: dict[str, str | int], sqlite_session: Session
+    ) -> None:
+        """Test non-SELECT statements always hit the database."""
+        connection = DatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+        statement = "UPDATE test_table SET name = 'c' WHERE id = :id"
+
+        with patch.object(
+            sqlite_session, "execute", wraps=sqlite_session.execute
+        ) as execute_spy:
+            first = connection.execute_cached(sqlite_session, statement, params={"id": 1})
+            second = connection.execute_cached(sqlite_session, statement, params={"id": 1})
+
+        assert first == []
+        assert second == []
+        assert execute_spy.call_count == 2
+
+    def test_bulk_insert_chunks_rows(
+        self, db_params: dict[str, str | int], mock_engine: MagicMock
+    ) -> None:
+        """Test bulk_insert batches rows through executemany."""
+        connection = DatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+        connection._engine = mock_engine
+        mock_cursor = mock_engine.raw_connection.return_value.cursor.return_value
+        rows = [(1, "a"), (2, "b"), (3, "c")]
+
+        connection.bulk_insert("test_table", ["id", "name"], rows, chunk_size=2)
+
+        expected_sql = "INSERT INTO test_table (id, name) VALUES (?, ?)"
+        assert mock_cursor.fast_executemany is True
+        assert mock_cursor.executemany.call_count == 2
+        mock_cursor.executemany.assert_any_call(expected_sql, [(1, "a"), (2, "b")])
+        mock_cursor.executemany.assert_any_call(expected_sql, [(3, "c")])
+        mock_engine.raw_connection.return_value.commit.assert_called_once()
+        mock_engine.raw_connection.return_value.close.assert_called_once()
+
+    def test_bulk_insert_not_initialised(
+        self, db_params: dict[str, str | int]
+    ) -> None:
+        """Test bulk_insert when connection is not initialised."""
+        connection = DatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+
+        with pytest.raises(DatabaseConnectionError) as exc_info:
+            connection.bulk_insert("test_table", ["id"], [(1,)])
+
+        assert str(exc_info.value) == "Database connection not initialised."
+
+    def test_bulk_insert_with_error(
         self, db_params: dict[str, str | int], mock_engine: MagicMock
     ) -> None:
-        """Test connection closure."""
+        """Test bulk_insert rolls back when executemany fails."""
         connection = DatabaseConnection(
             db=str(db_params["db"]),
             host=str(db_params["host"]),
@@ -276,19 +727,119 @@ class TestDatabaseConnection:
             timeout=int(db_params["timeout"]),
         )
         connection._engine = mock_engine
+        raw_connection = mock_engine.raw_connection.return_value
+        raw_connection.cursor.return_value.executemany.side_effect = ValueError(
+            "Test error"
+        )
+
+        with pytest.raises(ValueError):
+            connection.bulk_insert("test_table", ["id"], [(1,)])
+
+        raw_connection.rollback.assert_called_once()
+        raw_connection.commit.assert_not_called()
+        raw_connection.close.assert_called_once()
+
+    def test_close(
+        self, db_params: dict[str, str | int], mock_engine: MagicMock
+    ) -> None:
+        """Test connection closure detaches without disposing the shared engine."""
+        connection = DatabaseConnection(
+            db=str(db_params["db"]),
+            host=str(db_params["host"]),
+            port=int(db_params["port"]),
+            timeout=int(db_params["timeout"]),
+        )
+        # Typed intermediate so mypy does not narrow _engine to MagicMock,
+        # which would make the assertions below unreachable
+        engine: Engine | None = cast(Engine, mock_engine)
+        connection._engine = engine
 
         connection._close()
 
-        mock_engine.dispose.assert_called_once()
+        mock_engine.dispose.assert_not_called()
         assert connection._engine is None
+        assert connection._session_maker is None
+
+    def test_engine_reused_across_connections(
+        self, db_params: dict[str, str | int], mock_engine: MagicMock
+    ) -> None:
+        """Test that a second connection to the same target reuses the engine."""
+        with (
+            patch(
+                "sqlalchemy.engine.create_engine", return_value=mock_engine
+            ) as mock_create_engine,
+            patch("sqlalchemy.orm.sessionmaker"),
+            patch("sqlalchemy.event"),
+            patch("pyodbc.drivers", return_value=["ODBC Driver 17 for SQL Server"]),
+        ):
+            for _ in range(2):
+                connection = DatabaseConnection(
+                    db=str(db_params["db"]),
+                    host=str(db_params["host"]),
+                    port=int(db_params["port"]),
+                    timeout=int(db_params["timeout"]),
+                )
+                connection._init_connection()
+                assert connection._engine == mock_engine
+
+            mock_create_engine.assert_called_once()
+
+    def test_engine_not_reused_for_different_pool_settings(
+        self, db_params: dict[str, str | int], mock_engine: MagicMock
+    ) -> None:
+        """Test differing pool settings get their own engine, not the cached one."""
+        with (
+            patch(
+                "sqlalchemy.engine.create_engine", return_value=mock_engine
+            ) as mock_create_engine,
+            patch("sqlalchemy.orm.sessionmaker"),
+            patch("sqlalchemy.event"),
+            patch("pyodbc.drivers", return_value=["ODBC Driver 17 for SQL Server"]),
+        ):
+            for pool_size in (20, 50):
+                connection = DatabaseConnection(
+                    db=str(db_params["db"]),
+                    host=str(db_params["host"]),
+                    port=int(db_params["port"]),
+                    timeout=int(db_params["timeout"]),
+                    pool_size=pool_size,
+                )
+                connection._init_connection()
+
+            assert mock_create_engine.call_count == 2
+            assert mock_create_engine.call_args_list[1].kwargs["pool_size"] == 50
+
+    def test_shutdown(
+        self, db_params: dict[str, str | int], mock_engine: MagicMock
+    ) -> None:
+        """Test shutdown disposes cached engines and clears the cache."""
+        with (
+            patch("sqlalchemy.engine.create_engine", return_value=mock_engine),
+            patch("sqlalchemy.orm.sessionmaker"),
+            patch("sqlalchemy.event"),
+            patch("pyodbc.drivers", return_value=["ODBC Driver 17 for SQL Server"]),
+        ):
+            connection = DatabaseConnection(
+                db=str(db_params["db"]),
+                host=str(db_params["host"]),
+                port=int(db_params["port"]),
+                timeout=int(db_params["timeout"]),
+            )
+            connection._init_connection()
+
+        DatabaseConnection.shutdown()
+
+        mock_engine.dispose.assert_called_once()
+        assert DatabaseConnection._engine_cache == {}
 
     def test_get_connection_context_manager(
         self, db_params: dict[str, str | int], mock_engine: MagicMock
     ) -> None:
         """Test the get_connection context manager."""
         with (
-            patch("app.db.connect.create_engine", return_value=mock_engine),
-            patch("app.db.connect.sessionmaker"),
+            patch("sqlalchemy.engine.create_engine", return_value=mock_engine),
+            patch("sqlalchemy.orm.sessionmaker"),
+            patch("sqlalchemy.event"),
             patch("pyodbc.drivers", return_value=["ODBC Driver 17 for SQL Server"]),
         ):
             with DatabaseConnection.get_connection(
@@ -300,7 +851,8 @@ class TestDatabaseConnection:
                 assert isinstance(connection, DatabaseConnection)
                 assert connection._engine == mock_engine
 
-            mock_engine.dispose.assert_called_once()
+            # Engine stays cached for reuse rather than being disposed
+            mock_engine.dispose.assert_not_called()
 
     def test_get_connection_with_error(
         self, db_params: dict[str, str | int], mock_engine: MagicMock
@@ -309,8 +861,9 @@ class TestDatabaseConnection:
         test_error = ValueError("Test error")
 
         with (
-            patch("app.db.connect.create_engine", return_value=mock_engine),
-            patch("app.db.connect.sessionmaker"),
+            patch("sqlalchemy.engine.create_engine", return_value=mock_engine),
+            patch("sqlalchemy.orm.sessionmaker"),
+            patch("sqlalchemy.event"),
             patch("pyodbc.drivers", return_value=["ODBC Driver 17 for SQL Server"]),
             pytest.raises(ValueError),
         ):
@@ -322,4 +875,4 @@ class TestDatabaseConnection:
             ):
                 raise test_error
 
-        mock_engine.dispose.assert_called_once()
+        mock_engine.dispose.assert_not_called()